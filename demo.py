@@ -27,9 +27,11 @@ from docx_flow.conditions import (
     TableTextCondition,
     FunctionCondition,
 )
+from docx_flow.predicates import run_count
 from docx_flow.actions import (
     AlignParagraphAction,
     ReplaceTextAction,
+    BatchReplaceTextAction,
     SetTableWidthAction,
     RemoveTableBordersAction,
     AutoFitTableAction,
@@ -151,10 +153,13 @@ def main():
     # --- 1. 段落操作 ---
     print("\n--- 1. 处理段落 ---")
     # 1.1 文本替换
+    # 多组替换用 BatchReplaceTextAction 一次遍历完成
     editor.select_paragraphs()\
           .where(RegexCondition(r"【目标:文本替换】"))\
-          .apply(ReplaceTextAction("旧内容", "焕然一新的内容"))\
-          .apply(ReplaceTextAction("【目标:文本替换】", "【效果】"))
+          .apply(BatchReplaceTextAction([
+              ("旧内容", "焕然一新的内容"),
+              ("【目标:文本替换】", "【效果】"),
+          ]))
     print("  -> 1.1 文本替换... Done")
 
     # 1.2 对齐
@@ -233,8 +238,9 @@ def main():
 
     # 3.2 自定义函数筛选
     # 定义一个函数：检查段落是否包含超过2个run
+    # run_count 直接读取 XML 层，免去为每个 run 构造包装对象
     def has_multiple_runs(p: Paragraph) -> bool:
-        return isinstance(p, Paragraph) and len(p.runs) > 2
+        return isinstance(p, Paragraph) and run_count(p) > 2
     
     editor.select_paragraphs()\
           .where(FunctionCondition(has_multiple_runs))\
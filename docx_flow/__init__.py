@@ -36,6 +36,7 @@ from .selector import FluentSelector
 from .conditions import (
     Condition,
     RegexCondition,
+    MultiRegexCondition,
     TableColumnCondition,
     TableTextCondition,
     FunctionCondition
@@ -50,9 +51,12 @@ from .actions import (
     SetTabStopAction,
     ClearAndSetTabStopAction,
     ReplaceTextAction,
+    BatchReplaceTextAction,
+    MultiReplaceTextAction,
     SetFontSizeAction,
     SetSectionOrientationAction,
     AddPageNumberAction,
+    SetPageNumberingAction,
     ClearPageNumberAction
 )
 
@@ -62,6 +66,7 @@ __all__ = [
     "Condition",
     "Action",
     "RegexCondition",
+    "MultiRegexCondition",
     "TableColumnCondition",
     "FunctionCondition",
     "RemoveTableBordersAction",
@@ -69,6 +74,8 @@ __all__ = [
     "AlignParagraphAction",
     "SetTabStopAction",
     "ReplaceTextAction",
+    "BatchReplaceTextAction",
+    "MultiReplaceTextAction",
     "SetSectionOrientationAction",
     "SetTableColumnWidthAction",
     "ClearAndSetTabStopAction",
@@ -76,6 +83,7 @@ __all__ = [
     "TableTextCondition",
     "SetFontSizeAction",
     "AddPageNumberAction",
+    "SetPageNumberingAction",
     "ClearPageNumberAction"
 ]
 
@@ -5,7 +5,10 @@ Docx Enhanced Toolkit - 操作模块
 包含所有的操作类，用于对文档元素执行具体操作。
 """
 
+import logging
+import re
 from abc import ABC, abstractmethod
+from copy import deepcopy
 from typing import Any
 
 from docx.table import Table
@@ -14,12 +17,76 @@ from docx.section import Section
 from docx.shared import Inches, Cm, Pt
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.enum.section import WD_ORIENT
-from docx.oxml.ns import qn
-from docx.oxml import OxmlElement
+from docx.oxml.ns import qn, nsdecls, nsmap
+from docx.oxml import OxmlElement, parse_xml
+from lxml.etree import XPath
+
+from .conditions import invalidate_paragraph_text
+
+_log = logging.getLogger(__name__)
+
+# 常用的限定名在模块加载时计算一次。qn() 每次调用都要做前缀解析和
+# 字符串格式化，热循环中反复调用的开销可观。
+_QN_VAL = qn('w:val')
+_QN_TYPE = qn('w:type')
+_QN_W = qn('w:w')
+_QN_TBL_PR = qn('w:tblPr')
+_QN_TBL_BORDERS = qn('w:tblBorders')
+_QN_TC_BORDERS = qn('w:tcBorders')
+_QN_TBL_LAYOUT = qn('w:tblLayout')
+_QN_TBL_W = qn('w:tblW')
+_QN_PG_NUM_TYPE = qn('w:pgNumType')
+_QN_TC_PR = qn('w:tcPr')
+_QN_TC_W = qn('w:tcW')
+_QN_TC = qn('w:tc')
+_QN_TR = qn('w:tr')
+_QN_P = qn('w:p')
+_QN_H = qn('w:h')
+_QN_ORIENT = qn('w:orient')
+_QN_FLD_CHAR_TYPE = qn('w:fldCharType')
+_QN_START = qn('w:start')
+_QN_R = qn('w:r')
+_QN_RPR = qn('w:rPr')
+_QN_SZ = qn('w:sz')
+_QN_SZCS = qn('w:szCs')
+
+# 预编译的 XPath 查询：编译一次后求值全部在 C 层完成，
+# 比每次调用 find() 重新解析路径更快，用于逐单元格的热查询。
+_W_NSMAP = {'w': nsmap['w']}
+_X_TBL_BORDERS = XPath('./w:tblBorders', namespaces=_W_NSMAP)
+_X_TC_BORDERS = XPath('./w:tcBorders', namespaces=_W_NSMAP)
+
+# 预构建的"无边框"XML模板：模块加载时解析一次，使用时 deepcopy 复用，
+# 避免在每个单元格上重复进行 6 次 OxmlElement 构造与 find 扫描。
+_BORDER_EDGES = ("top", "left", "bottom", "right", "insideH", "insideV")
+_NIL_EDGES_XML = ''.join(f'<w:{edge} w:val="nil"/>' for edge in _BORDER_EDGES)
+_NIL_TBL_BORDERS = parse_xml(
+    f'<w:tblBorders {nsdecls("w")}>{_NIL_EDGES_XML}</w:tblBorders>')
+_NIL_TC_BORDERS = parse_xml(
+    f'<w:tcBorders {nsdecls("w")}>{_NIL_EDGES_XML}</w:tcBorders>')
+
+_NSDECLS_W = nsdecls('w')
+
+# 常用长度值缓存：Pt/Cm 每次调用都构造新的 Length 对象，
+# 循环中批量实例化 Action 时直接复用现成对象。
+_PT_CACHE = {i: Pt(i) for i in range(1, 73)}
+_CM_CACHE = {i / 2: Cm(i / 2) for i in range(1, 41)}   # 0.5cm 步进，至 20cm
+
+
+def _new_tbl_layout(layout_type: str):
+    """构造 <w:tblLayout>：一次 C 级解析代替 OxmlElement+set 两步。"""
+    return parse_xml(f'<w:tblLayout {_NSDECLS_W} w:type="{layout_type}"/>')
+
+
+def _new_tbl_w(w, w_type: str):
+    """构造 <w:tblW>。"""
+    return parse_xml(f'<w:tblW {_NSDECLS_W} w:w="{w}" w:type="{w_type}"/>')
 
 
 class Action(ABC):
     """'操作'接口 (抽象基类)"""
+    __slots__ = ()
+
     @abstractmethod
     def execute(self, element: Any) -> None:
         """
@@ -31,51 +98,45 @@ class Action(ABC):
 
 class RemoveTableBordersAction(Action):
     """移除表格边框的操作。将所有边设置为nil，防止Word回退到表格样式边框。"""
+    __slots__ = ()
+
     def execute(self, element: Any) -> None:
-        if not isinstance(element, Table):
+        if type(element) is not Table:
             return
+        self.execute_table(element)
+
+    def execute_table(self, element: Table) -> None:
+        """表格特化路径：免去 execute 内的类型分发。"""
         # 获取表格的样式对象
         tbl = element._tbl
         tbl_pr = tbl.tblPr
-        # 处理<w:tblBorders>
+        # 处理<w:tblBorders>：替换为预构建的 nil 模板
         if tbl_pr is not None:
-            tbl_borders = tbl_pr.find(qn('w:tblBorders'))
-            if tbl_borders is None:
-                tbl_borders = OxmlElement('w:tblBorders')
-                tbl_pr.append(tbl_borders)
-            for edge in ["top", "left", "bottom", "right", "insideH", "insideV"]:
-                tag = qn(f"w:{edge}")
-                border = tbl_borders.find(tag)
-                if border is None:
-                    border = OxmlElement(f"w:{edge}")
-                    tbl_borders.append(border)
-                border.set(qn('w:val'), 'nil')
-        # 为所有单元格移除边框（同样设置为nil）
-        for row in element.rows:
-            for cell in row.cells:
-                tc = cell._tc
-                tc_pr = tc.tcPr
-                if tc_pr is not None:
-                    tc_borders = tc_pr.find(qn('w:tcBorders'))
-                    if tc_borders is None:
-                        tc_borders = OxmlElement('w:tcBorders')
-                        tc_pr.append(tc_borders)
-                    for edge in ["top", "left", "bottom", "right", "insideH", "insideV"]:
-                        tag = qn(f"w:{edge}")
-                        border = tc_borders.find(tag)
-                        if border is None:
-                            border = OxmlElement(f"w:{edge}")
-                            tc_borders.append(border)
-                        border.set(qn('w:val'), 'nil')
+            existing = _X_TBL_BORDERS(tbl_pr)
+            if existing:
+                tbl_pr.remove(existing[0])
+            tbl_pr.append(deepcopy(_NIL_TBL_BORDERS))
+        # 为所有单元格移除边框（同样设置为nil）。
+        # 用 lxml 的 C 级 iter() 直达所有 w:tc 元素（含嵌套表格），
+        # 不经过 rows/cells 属性重建 _Row/_Cell 包装对象。
+        for tc in tbl.iter(_QN_TC):
+            tc_pr = tc.tcPr
+            if tc_pr is not None:
+                existing = _X_TC_BORDERS(tc_pr)
+                if existing:
+                    tc_pr.remove(existing[0])
+                tc_pr.append(deepcopy(_NIL_TC_BORDERS))
 
 
 class SetTableWidthAction:
+    __slots__ = ('width',)
+
     def __init__(self, width):
         # 接受任何 Length 类型，也可直接给 int(twips)
         self.width = width
 
     def execute(self, element: Any) -> None:
-        if not isinstance(element, Table):
+        if type(element) is not Table:
             return
 
         # 关闭自动调整，保持固定列宽
@@ -86,25 +147,29 @@ class SetTableWidthAction:
             tbl_pr = OxmlElement('w:tblPr')
             element._tbl.insert(0, tbl_pr)
 
-        # 固定布局
-        layout = tbl_pr.find(qn('w:tblLayout'))
-        if layout is None:
-            layout = OxmlElement('w:tblLayout')
-            layout.set(qn('w:type'), 'fixed')
-            tbl_pr.append(layout)
-
-        # 表格宽度
-        tbl_w = tbl_pr.find(qn('w:tblW'))
-        if tbl_w is None:
-            tbl_w = OxmlElement('w:tblW')
-            tbl_pr.append(tbl_w)
+        # 清除旧的布局/宽度设置，一次子元素扫描
+        for child in list(tbl_pr):
+            if child.tag == _QN_TBL_LAYOUT or child.tag == _QN_TBL_W:
+                tbl_pr.remove(child)
 
         # 把输入宽度统一转为 twips
         length = self.width
         if hasattr(length, 'twips'):
             length = length.twips      # Inches/Cm/Pt 等
-        tbl_w.set(qn('w:w'), str(int(length)))
-        tbl_w.set(qn('w:type'), 'dxa')
+
+        # 固定布局 + 表格宽度：由模板一次解析生成
+        tbl_pr.append(_new_tbl_layout('fixed'))
+        tbl_pr.append(_new_tbl_w(int(length), 'dxa'))
+
+
+# AutoFitTableAction 的布局配置表：
+# autofit_type -> (allow_autofit, tblLayout 类型, tblW 值, tblW 单位)
+# tblW 值为 None 表示 fixed 模式，总宽和列宽在 execute 中按列数计算。
+_AUTOFIT = {
+    'contents': (True, 'autofit', '0', 'auto'),
+    'window': (True, 'autofit', '5000', 'pct'),
+    'fixed': (False, 'fixed', None, None),
+}
 
 
 class AutoFitTableAction(Action):
@@ -127,7 +192,7 @@ class AutoFitTableAction(Action):
         self.first_col_ratio = first_col_ratio
 
     def execute(self, element: Any) -> None:
-        if not isinstance(element, Table):
+        if type(element) is not Table:
             return
         
         
@@ -138,11 +203,10 @@ class AutoFitTableAction(Action):
             tbl_pr = OxmlElement('w:tblPr')
             tbl.insert(0, tbl_pr)
 
-        # 清理可能冲突的旧设置
-        for tag in ['w:tblLayout', 'w:tblW']:
-            existing = tbl_pr.find(qn(tag))
-            if existing is not None:
-                tbl_pr.remove(existing)
+        # 清理可能冲突的旧设置：对子元素做一次线性扫描
+        for child in list(tbl_pr):
+            if child.tag == _QN_TBL_LAYOUT or child.tag == _QN_TBL_W:
+                tbl_pr.remove(child)
 
         # 优先处理 first_col_ratio 逻辑
         if self.first_col_ratio is not None:
@@ -151,15 +215,10 @@ class AutoFitTableAction(Action):
                 return
 
             # 1. 设置为固定布局，这是按比例分配宽度的前提
-            tbl_layout = OxmlElement('w:tblLayout')
-            tbl_layout.set(qn('w:type'), 'fixed')
-            tbl_pr.append(tbl_layout)
-
-            # 2. 设置表格总宽度为100%窗口宽度 (参考 _apply_autofit_window)
-            tbl_w = OxmlElement('w:tblW')
-            tbl_w.set(qn('w:w'), '5000')  # 5000 在OOXML中代表 100%
-            tbl_w.set(qn('w:type'), 'pct')
-            tbl_pr.append(tbl_w)
+            tbl_pr.append(_new_tbl_layout('fixed'))
+
+            # 2. 设置表格总宽度为100%窗口宽度 (5000 在OOXML中代表 100%)
+            tbl_pr.append(_new_tbl_w('5000', 'pct'))
             
             # 关闭高阶API的自动调整
             element.allow_autofit = False
@@ -175,50 +234,41 @@ class AutoFitTableAction(Action):
             else: # 如果只有一列
                 widths = [5000]
 
-            # 直接操作第一行单元格的XML来设置百分比宽度
-            first_row_cells = element.rows[0].cells
-            for i, cell in enumerate(first_row_cells):
-                tc_pr = cell._tc.get_or_add_tcPr()
-                tc_w = tc_pr.get_or_add_tcW()
-                tc_w.set(qn('w:w'), str(widths[i]))
-                tc_w.set(qn('w:type'), 'pct')
-
-        # 如果没有设置 first_col_ratio，则执行原有的逻辑
+            # 直接操作第一行单元格的XML来设置百分比宽度。
+            # 注意 OOXML 中 tcPr 必须是 tc 的第一个子元素，
+            # tcW 也位于 tcPr 的子元素序列前部，因此都 insert(0)。
+            for i, tc in enumerate(tbl.tr_lst[0].tc_lst):
+                if i >= col_count:
+                    break
+                tc_pr = tc.find(_QN_TC_PR)
+                if tc_pr is None:
+                    tc_pr = OxmlElement('w:tcPr')
+                    tc.insert(0, tc_pr)
+                tc_w = tc_pr.find(_QN_TC_W)
+                if tc_w is None:
+                    tc_w = OxmlElement('w:tcW')
+                    tc_pr.insert(0, tc_w)
+                tc_w.set(_QN_W, str(widths[i]))
+                tc_w.set(_QN_TYPE, 'pct')
+
+        # 如果没有设置 first_col_ratio，则按配置表驱动布局设置
         else:
-            if self.autofit_type == 'contents':
-                element.allow_autofit = True
-                tbl_layout = OxmlElement('w:tblLayout')
-                tbl_layout.set(qn('w:type'), 'autofit')
-                tbl_pr.append(tbl_layout)
-                tbl_w = OxmlElement('w:tblW')
-                tbl_w.set(qn('w:w'), '0')
-                tbl_w.set(qn('w:type'), 'auto')
-                tbl_pr.append(tbl_w)
-                
-            elif self.autofit_type == 'window':
-                element.allow_autofit = True
-                tbl_layout = OxmlElement('w:tblLayout')
-                tbl_layout.set(qn('w:type'), 'autofit')
-                tbl_pr.append(tbl_layout)
-                tbl_w = OxmlElement('w:tblW')
-                tbl_w.set(qn('w:w'), '5000')
-                tbl_w.set(qn('w:type'), 'pct')
-                tbl_pr.append(tbl_w)
-                
-            elif self.autofit_type == 'fixed':
-                element.allow_autofit = False
-                tbl_layout = OxmlElement('w:tblLayout')
-                tbl_layout.set(qn('w:type'), 'fixed')
-                tbl_pr.append(tbl_layout)
-                
+            config = _AUTOFIT.get(self.autofit_type)
+            if config is None:
+                return
+            allow_autofit, layout, w, w_type = config
+            element.allow_autofit = allow_autofit
+            tbl_pr.append(_new_tbl_layout(layout))
+
+            if w is not None:
+                tbl_pr.append(_new_tbl_w(w, w_type))
+            else:
+                # fixed：总宽 6.5 英寸，各列平均分配
                 total_width = Inches(6.5)
                 col_count = len(element.columns)
                 if col_count > 0:
                     col_width = int(total_width / col_count)
-                    tbl_w = OxmlElement('w:tblW')
-                    tbl_w.set(qn('w:w'), str(int(total_width.twips)))
-                    tbl_w.set(qn('w:type'), 'dxa')
-                    tbl_pr.append(tbl_w)
+                    tbl_pr.append(_new_tbl_w(int(total_width.twips), 'dxa'))
                     for column in element.columns:
                         column.width = col_width
 
@@ -227,6 +277,7 @@ class SetTableColumnWidthAction:
     """
     将表格切换到"固定布局"并精确设置每列宽度。
     """
+    __slots__ = ('widths',)
 
     def __init__(self, widths):
         """
@@ -235,7 +286,7 @@ class SetTableColumnWidthAction:
         self.widths = widths
 
     def execute(self, table: Table) -> None:
-        if not isinstance(table, Table):
+        if type(table) is not Table:
             raise TypeError("只能传入 python-docx.Table 对象")
 
         if len(table.columns) != len(self.widths):
@@ -249,10 +300,28 @@ class SetTableColumnWidthAction:
         else:
             table.allow_autofit = False         # 旧版别名
 
-        # ② 为每个单元格写入宽度
-        for row in table.rows:
-            for idx, width in enumerate(self.widths):
-                row.cells[idx].width = width
+        tbl = table._tbl
+        twips = [str(int(w.twips if hasattr(w, 'twips') else w))
+                 for w in self.widths]
+
+        # ② 一次性重写 <w:tblGrid>，列宽由 gridCol 统一定义
+        new_grid = parse_xml(
+            f'<w:tblGrid {nsdecls("w")}>'
+            + ''.join(f'<w:gridCol w:w="{t}"/>' for t in twips)
+            + '</w:tblGrid>')
+        tbl.replace(tbl.tblGrid, new_grid)
+
+        # ③ 直接在 XML 层为每个单元格盖上 <w:tcW>，
+        #    跳过 row.cells 的合并检测和 _Cell.width 写入器。
+        #    iterchildren 在 C 层遍历，且不像 tr_lst/tc_lst 那样
+        #    每次访问都 findall 出一个中间列表；zip 自然截断超出
+        #    宽度表的单元格。
+        for tr in tbl.iterchildren(_QN_TR):
+            for tc, width in zip(tr.iterchildren(_QN_TC), twips):
+                tc_pr = tc.get_or_add_tcPr()
+                tc_w = tc_pr.get_or_add_tcW()
+                tc_w.set(_QN_W, width)
+                tc_w.set(_QN_TYPE, 'dxa')
 
 
 class AlignParagraphAction(Action):
@@ -267,17 +336,17 @@ class AlignParagraphAction(Action):
         self.alignment = alignment_map.get(alignment.lower())
 
     def execute(self, element: Any) -> None:
-        if isinstance(element, Paragraph) and self.alignment is not None:
+        if type(element) is Paragraph and self.alignment is not None:
             element.alignment = self.alignment
 
 
 class SetTabStopAction(Action):
     """设置段落制表位的操作。"""
     def __init__(self, position_in_cm: float):
-        self.position = Cm(position_in_cm)
+        self.position = _CM_CACHE.get(position_in_cm) or Cm(position_in_cm)
 
     def execute(self, element: Any) -> None:
-        if isinstance(element, Paragraph):
+        if type(element) is Paragraph:
             p_format = element.paragraph_format
             p_format.tab_stops.add_tab_stop(self.position)
 
@@ -285,10 +354,10 @@ class SetTabStopAction(Action):
 class ClearAndSetTabStopAction(Action):
     """清除现有制表位并设置新制表位的操作。"""
     def __init__(self, position_in_cm: float):
-        self.position = Cm(position_in_cm)
+        self.position = _CM_CACHE.get(position_in_cm) or Cm(position_in_cm)
 
     def execute(self, element: Any) -> None:
-        if isinstance(element, Paragraph):
+        if type(element) is Paragraph:
             p_format = element.paragraph_format
             # 清除所有现有制表位
             p_format.tab_stops.clear_all()
@@ -298,28 +367,151 @@ class ClearAndSetTabStopAction(Action):
 
 class ReplaceTextAction(Action):
     """替换文本的操作（段落和表格内）。"""
+    __slots__ = ('old_text', 'new_text', '_precheck')
+
     def __init__(self, old_text: str, new_text: str):
         self.old_text = old_text
         self.new_text = new_text
+        # run.text 会把 w:tab/w:br 渲染成 \t/\n，而原始文本节点里没有
+        # 这些字符；只有不含控制字符的目标串才能安全地做原始文本预判。
+        self._precheck = '\t' not in old_text and '\n' not in old_text
 
     def execute(self, element: Any) -> None:
-        if isinstance(element, Paragraph):
-            self.replace_in_paragraph(element)
-        elif isinstance(element, Table):
-            for row in element.rows:
-                for cell in row.cells:
-                    for p in cell.paragraphs:
-                        self.replace_in_paragraph(p)
-    
+        if type(element) is Paragraph:
+            self.execute_paragraph(element)
+        elif type(element) is Table:
+            self.execute_table(element)
+
+    def execute_paragraph(self, element: Paragraph) -> None:
+        """段落特化路径：免去 execute 内的类型分发。"""
+        self._replace_in_p(element._p)
+
+    def execute_table(self, element: Table) -> None:
+        """表格特化路径：免去 execute 内的类型分发。"""
+        tbl = element._tbl
+        # 表级预判：整表文本一次 C 级子串扫描，
+        # 不含目标串的表格直接整体跳过，不进逐段循环。
+        if self._precheck and self.old_text not in ''.join(tbl.itertext()):
+            return
+        # C 级 iter() 直达表格内所有 w:p 元素（含嵌套表格），
+        # 不构造 _Row/_Cell/Paragraph 包装对象。
+        for p in tbl.iter(_QN_P):
+            self._replace_in_p(p)
+
     def replace_in_paragraph(self, paragraph: Paragraph):
         """在段落中替换文本，保留格式。"""
-        for run in paragraph.runs:
-            if self.old_text in run.text:
-                run.text = run.text.replace(self.old_text, self.new_text)
+        self._replace_in_p(paragraph._p)
+
+    def _replace_in_p(self, p) -> None:
+        """在 w:p 元素内逐 run 替换文本，直接操作 XML 层。"""
+        # 预判：对段落原始文本节点做一次 C 级子串扫描，
+        # 大多数不含目标串的段落在这里直接返回，不进 run 循环。
+        if self._precheck and self.old_text not in ''.join(p.itertext()):
+            return
+        for r in p.r_lst:
+            text = r.text
+            if self.old_text in text:
+                r.text = text.replace(self.old_text, self.new_text)
+                # 文本已变更，使段落文本缓存失效
+                invalidate_paragraph_text(p)
+
+
+class BatchReplaceTextAction(Action):
+    """批量替换文本的操作：一次遍历应用多组替换（段落和表格内）。
+
+    等价于连续 apply 多个 ReplaceTextAction，但选中元素及其 run
+    只被遍历一次。
+    """
+    __slots__ = ('pairs',)
+
+    def __init__(self, pairs):
+        """
+        :param pairs: (old_text, new_text) 二元组序列，按给定顺序依次替换。
+        """
+        self.pairs = list(pairs)
+
+    def execute(self, element: Any) -> None:
+        if type(element) is Paragraph:
+            self.execute_paragraph(element)
+        elif type(element) is Table:
+            self.execute_table(element)
+
+    def execute_paragraph(self, element: Paragraph) -> None:
+        """段落特化路径：免去 execute 内的类型分发。"""
+        self._replace_in_p(element._p)
+
+    def execute_table(self, element: Table) -> None:
+        """表格特化路径：免去 execute 内的类型分发。"""
+        for p in element._tbl.iter(_QN_P):
+            self._replace_in_p(p)
+
+    def replace_in_paragraph(self, paragraph: Paragraph):
+        """在段落中依次应用所有替换，保留格式。"""
+        self._replace_in_p(paragraph._p)
+
+    def _replace_in_p(self, p) -> None:
+        """在 w:p 元素内逐 run 依次应用所有替换，直接操作 XML 层。"""
+        for r in p.r_lst:
+            text = r.text
+            changed = False
+            for old, new in self.pairs:
+                if old in text:
+                    text = text.replace(old, new)
+                    changed = True
+            if changed:
+                r.text = text
+                invalidate_paragraph_text(p)
+
+
+class MultiReplaceTextAction(Action):
+    """多模式替换文本的操作：用一个编译好的交替正则一次扫描完成多组替换。
+
+    与 BatchReplaceTextAction 的逐对 str.replace 不同，本操作把所有
+    目标串编译成单个交替模式（按长度降序，保证最长匹配优先），对每段
+    run 文本只做一次 O(n) 扫描，目标串数量多时更有优势。
+    """
+    __slots__ = ('_mapping', '_pattern', '_sub')
+
+    def __init__(self, mapping):
+        """
+        :param mapping: {old_text: new_text} 映射。
+        """
+        self._mapping = dict(mapping)
+        keys = sorted(self._mapping, key=len, reverse=True)
+        self._pattern = re.compile('|'.join(map(re.escape, keys)))
+        self._sub = self._mapping.__getitem__
+
+    def execute(self, element: Any) -> None:
+        if type(element) is Paragraph:
+            self.execute_paragraph(element)
+        elif type(element) is Table:
+            self.execute_table(element)
+
+    def execute_paragraph(self, element: Paragraph) -> None:
+        """段落特化路径：免去 execute 内的类型分发。"""
+        self._replace_in_p(element._p)
+
+    def execute_table(self, element: Table) -> None:
+        """表格特化路径：免去 execute 内的类型分发。"""
+        for p in element._tbl.iter(_QN_P):
+            self._replace_in_p(p)
+
+    def _replace_in_p(self, p) -> None:
+        """在 w:p 元素内逐 run 做单遍多模式替换，直接操作 XML 层。"""
+        sub = self._pattern.sub
+        repl = lambda m: self._sub(m.group(0))
+        for r in p.r_lst:
+            text = r.text
+            new_text = sub(repl, text)
+            if new_text != text:
+                r.text = new_text
+                invalidate_paragraph_text(p)
 
 
 class SetFontSizeAction(Action):
     """修改字号的操作。"""
+    __slots__ = ('absolute_size', 'relative_change')
+
     def __init__(self, size: Any):
         """
         :param size: 字号。可以是：
@@ -336,37 +528,61 @@ class SetFontSizeAction(Action):
                 elif size.startswith('-'):
                     self.relative_change = -int(size[1:])
                 else:
-                    self.absolute_size = Pt(int(size))
+                    size_int = int(size)
+                    self.absolute_size = _PT_CACHE.get(size_int) or Pt(size_int)
             except (ValueError, TypeError):
                 raise ValueError("Invalid size format for string. Use '+n', '-n', or a number string.")
         elif isinstance(size, (int, float)):
-            self.absolute_size = Pt(size)
+            self.absolute_size = _PT_CACHE.get(size) or Pt(size)
         else:
             raise TypeError("Size must be an int, float, or string.")
 
     def execute(self, element: Any) -> None:
-        if isinstance(element, Paragraph):
-            self._apply_to_paragraph(element)
-        elif isinstance(element, Table):
-            for row in element.rows:
-                for cell in row.cells:
-                    for p in cell.paragraphs:
-                        self._apply_to_paragraph(p)
-
-    def _apply_to_paragraph(self, paragraph: Paragraph):
-        """将字号更改应用于段落中的所有 run。"""
-        for run in paragraph.runs:
-            font = run.font
-            if self.absolute_size:
-                font.size = self.absolute_size
-            elif self.relative_change:
-                # 只有在已明确设置了字号的情况下才能进行相对更改
-                current_size = font.size
-                if current_size is not None:
-                    new_size_pt = current_size.pt + self.relative_change
-                    if new_size_pt > 0:  # 字号必须是正数
-                        font.size = Pt(new_size_pt)
-
+        if type(element) is Paragraph:
+            self.execute_paragraph(element)
+        elif type(element) is Table:
+            self.execute_table(element)
+
+    def execute_paragraph(self, element: Paragraph) -> None:
+        """段落特化路径：直接迭代 XML 层的 w:r，绕过 runs 属性
+        逐次重建 Run 包装对象和 font.size 描述符链。"""
+        for r in element._p.iter(_QN_R):
+            self._apply_to_run_xml(r)
+
+    def execute_table(self, element: Table) -> None:
+        """表格特化路径：直接迭代 XML 层的 w:r，绕过
+        rows/cells/paragraphs 四层包装属性的逐次解析。"""
+        for r in element._tbl.iter(_QN_R):
+            self._apply_to_run_xml(r)
+
+    def _apply_to_run_xml(self, r) -> None:
+        """直接在 w:r 元素上写入 <w:sz>/<w:szCs>（单位：半磅）。"""
+        rPr = r.find(_QN_RPR)
+        if self.absolute_size:
+            half_pts = str(int(self.absolute_size.pt * 2))
+            if rPr is None:
+                rPr = OxmlElement('w:rPr')
+                r.insert(0, rPr)   # rPr 必须是 r 的第一个子元素
+            for tag, name in ((_QN_SZ, 'w:sz'), (_QN_SZCS, 'w:szCs')):
+                el = rPr.find(tag)
+                if el is None:
+                    el = OxmlElement(name)
+                    rPr.append(el)
+                el.set(_QN_VAL, half_pts)
+        elif self.relative_change:
+            # 只有在已明确设置了字号的情况下才能进行相对更改
+            if rPr is None:
+                return
+            sz = rPr.find(_QN_SZ)
+            if sz is None or sz.get(_QN_VAL) is None:
+                return
+            half_pts = int(float(sz.get(_QN_VAL))) + self.relative_change * 2
+            if half_pts > 0:
+                val = str(half_pts)
+                sz.set(_QN_VAL, val)
+                szcs = rPr.find(_QN_SZCS)
+                if szcs is not None:
+                    szcs.set(_QN_VAL, val)
 
 class SetSectionOrientationAction(Action):
     """设置节页面方向的操作。"""
@@ -377,24 +593,33 @@ class SetSectionOrientationAction(Action):
         if not isinstance(element, Section):
             raise TypeError("只能对 Section 对象使用 SetSectionOrientationAction")
         
-        original_width = element.page_width
-        original_height = element.page_height
-            
-        print(f"设置节页面方向为: {self.orientation.name}", f"原始宽度: {original_width}, 高度: {original_height}")
+        # 直接在 <w:pgSz> 上读写：page_width/page_height/orientation
+        # 每个属性访问都要经过描述符链重新定位 pgSz，这里一次定位、
+        # 两次属性读、三次属性写完成同样的语义。
+        pg_sz = element._sectPr.get_or_add_pgSz()
+        w = pg_sz.get(_QN_W)
+        h = pg_sz.get(_QN_H)
+
+        _log.debug("设置节页面方向为: %s (原始宽度: %s, 高度: %s)",
+                   self.orientation.name, w, h)
         # 检查是否有有效的页面尺寸
-        if original_width is None or original_height is None:
-            print("警告: 节没有设置页面尺寸，使用默认 A4 尺寸。")
-            # 使用A4纸张尺寸作为默认值 (单位: Twips, 1 inch = 1440 twips)
-            # A4: 210mm x 297mm = 8.27" x 11.69"
-            from docx.shared import Inches
-            original_width = Inches(8.27)
-            original_height = Inches(11.69)
-            
-        # 设为横向
-        element.orientation = WD_ORIENT.LANDSCAPE
-        # 交换宽高，确保宽度大于高度（横向特征）
-        element.page_width = max(original_width, original_height)
-        element.page_height = min(original_width, original_height)
+        if w is None or h is None:
+            _log.warning("节没有设置页面尺寸，使用默认 A4 尺寸。")
+            # A4 纵向: 210mm x 297mm = 11906 x 16838 (单位: Twips)
+            w, h = 11906, 16838
+        else:
+            w, h = int(w), int(h)
+
+        # 按目标方向排列宽高（横向宽>高，纵向高>宽）
+        if self.orientation == WD_ORIENT.LANDSCAPE:
+            new_w, new_h = max(w, h), min(w, h)
+            orient = 'landscape'
+        else:
+            new_w, new_h = min(w, h), max(w, h)
+            orient = 'portrait'
+        pg_sz.set(_QN_W, str(new_w))
+        pg_sz.set(_QN_H, str(new_h))
+        pg_sz.set(_QN_ORIENT, orient)
 
 
 class AddPageNumberAction(Action):
@@ -472,23 +697,55 @@ class AddPageNumberAction(Action):
         """创建页码字段的XML元素"""
         # 创建页码字段的XML结构
         fldChar_begin = OxmlElement('w:fldChar')
-        fldChar_begin.set(qn('w:fldCharType'), 'begin')
+        fldChar_begin.set(_QN_FLD_CHAR_TYPE, 'begin')
         
         instrText = OxmlElement('w:instrText')
         instrText.text = 'PAGE'
         
         fldChar_end = OxmlElement('w:fldChar')
-        fldChar_end.set(qn('w:fldCharType'), 'end')
+        fldChar_end.set(_QN_FLD_CHAR_TYPE, 'end')
         
         return fldChar_begin, instrText, fldChar_end
     
     def _create_page_number_type(self, start_num=1):
         """创建页码类型元素，用于设置页码起始值"""
         num_type = OxmlElement('w:pgNumType')
-        num_type.set(qn('w:start'), str(start_num))
+        num_type.set(_QN_START, str(start_num))
         return num_type
     
 
+class SetPageNumberingAction(Action):
+    """按节批量设定页码终态的操作：一次节遍历完成清除与添加。
+
+    等价于先对全部节 apply ClearPageNumberAction、再对个别节逐一
+    apply AddPageNumberAction，但每个节的页脚只被改写一次，不做
+    "先清后建"的重复 XML 写入。
+
+    节索引按 execute 的调用顺序递增计数，因此本操作是一次性的，
+    应通过 select_sections().apply(...) 对全部节按文档顺序应用。
+    """
+    def __init__(self, specs):
+        """
+        :param specs: {节索引: None 或 AddPageNumberAction 的关键字参数 dict}。
+                      None 表示该节清除页码；未出现的节保持原样。
+        """
+        self._actions = {}
+        for idx, spec in dict(specs).items():
+            if spec is None:
+                self._actions[idx] = ClearPageNumberAction()
+            else:
+                self._actions[idx] = AddPageNumberAction(**spec)
+        self._position = 0
+
+    def execute(self, element: Any) -> None:
+        if not isinstance(element, Section):
+            return
+        action = self._actions.get(self._position)
+        self._position += 1
+        if action is not None:
+            action.execute(element)
+
+
 class ClearPageNumberAction(Action):
     """清除节页脚页码的操作。"""
     def execute(self, element: Any) -> None:
@@ -507,6 +764,6 @@ class ClearPageNumberAction(Action):
         
         # 移除节属性中的页码设置
         sectPr = element._sectPr
-        pg_num_type = sectPr.find(qn('w:pgNumType'))
+        pg_num_type = sectPr.find(_QN_PG_NUM_TYPE)
         if pg_num_type is not None:
             sectPr.remove(pg_num_type)
\ No newline at end of file
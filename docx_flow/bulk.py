@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+Docx Enhanced Toolkit - 批量构建模块
+
+包含批量写入文档内容的辅助函数，绕开 python-docx 逐单元格、
+逐段落的高层写入路径，直接在 XML 层构造内容。
+"""
+
+from xml.sax.saxutils import escape
+from zipfile import ZIP_STORED
+
+import docx.opc.phys_pkg as _phys_pkg
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls, qn
+
+_NSDECLS_W = nsdecls('w')
+_QN_P = qn('w:p')
+_QN_TR = qn('w:tr')
+_QN_TC = qn('w:tc')
+_QN_SECT_PR = qn('w:sectPr')
+
+
+def save_fast(doc, path) -> None:
+    """不压缩地保存文档，适用于马上会被重新读取的中间产物。
+
+    :param doc: python-docx 的 Document 对象。
+    :param path: 输出路径或可写流。
+
+    小文档 doc.save 的大头是 DEFLATE 压缩；对 "存完即读" 的临时
+    docx（如示例管线的 *_input.docx），以 ZIP_STORED 直写可以把
+    序列化时间砍掉一半以上，代价只是临时文件体积变大。python-docx
+    的 zip 写入器从模块全局取压缩常量，这里在写入期间临时替换它。
+    最终交付给用户的文档仍应走常规 save。
+    """
+    saved = _phys_pkg.ZIP_DEFLATED
+    _phys_pkg.ZIP_DEFLATED = ZIP_STORED
+    try:
+        doc.save(path)
+    finally:
+        _phys_pkg.ZIP_DEFLATED = saved
+
+
+def _new_p(text: str):
+    """构造包含单个 run 的 <w:p> 元素，一次 C 级解析完成。"""
+    return parse_xml(
+        f'<w:p {_NSDECLS_W}><w:r><w:t xml:space="preserve">'
+        f'{escape(text)}</w:t></w:r></w:p>')
+
+
+def bulk_add_paragraphs(doc, texts) -> None:
+    """一次性在文档主体末尾追加多个纯文本段落。
+
+    :param doc: python-docx 的 Document 对象。
+    :param texts: 段落文本序列，每项生成一个单 run 段落。
+
+    逐个 doc.add_paragraph 每次都要重建 Paragraph 包装对象并走样式
+    解析；这里把所有 <w:p> 预先构造好，整批插入主体（保持在末尾的
+    <w:sectPr> 之前）。
+    """
+    body = doc.element.body
+    new_ps = [_new_p(text) for text in texts]
+    sect_pr = body.find(_QN_SECT_PR)
+    if sect_pr is not None:
+        idx = body.index(sect_pr)
+        body[idx:idx] = new_ps
+    else:
+        body.extend(new_ps)
+
+
+def populate_table(table, data) -> None:
+    """按行批量填充表格文本。
+
+    :param table: python-docx 的 Table 对象。
+    :param data: 二维字符串序列，按 (行, 列) 顺序写入；值为 None 的
+                 单元格保持原样，超出 data 范围的行列不受影响。
+
+    逐格的 cell(i, j).text = ... 每次都要经过 row/cell 包装对象
+    构造和 _Cell.text 写入器；这里直接把单元格的 <w:p> 替换为
+    预解析的段落元素。
+    """
+    for tr, row_data in zip(table._tbl.iterchildren(_QN_TR), data):
+        for tc, text in zip(tr.iterchildren(_QN_TC), row_data):
+            if text is None:
+                continue
+            # 移除原有段落后补上新内容（tcPr 仍保持首位）
+            for p in tc.findall(_QN_P):
+                tc.remove(p)
+            tc.append(_new_p(text))
@@ -7,14 +7,61 @@ Docx Enhanced Toolkit - 条件模块
 
 import re
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from typing import Any, Callable
+from weakref import WeakKeyDictionary
 
 from docx.table import Table
 from docx.text.paragraph import Paragraph
 
 
+# 可选的第三方正则引擎：google-re2 是 DFA 实现，匹配时间与输入线性相关，
+# 对上千段落的非字面量筛选明显快于标准库的回溯引擎。未安装时自动回退。
+try:
+    import re2 as _re_engine
+except ImportError:
+    _re_engine = None
+
+
+@lru_cache(maxsize=512)
+def _compile(pattern: str):
+    """编译正则表达式并缓存结果，跨 RegexCondition 实例复用编译好的对象。
+
+    优先使用 re2（如可用）；re2 不支持的语法（如反向引用）回退标准库。
+    """
+    if _re_engine is not None:
+        try:
+            return _re_engine.compile(pattern)
+        except Exception:
+            pass
+    return re.compile(pattern)
+
+
+# 段落文本缓存：以段落的 XML 元素 (w:p) 为键。
+# Paragraph.text 每次访问都要遍历并拼接所有 run，链式 .where() 调用会对
+# 同一段落重复读取；在此缓存一次拼接结果，修改文本的操作负责失效。
+_para_text_cache = WeakKeyDictionary()
+
+
+def cached_paragraph_text(paragraph: Paragraph) -> str:
+    """读取段落文本，命中缓存时避免重新拼接 run。"""
+    p = paragraph._p
+    text = _para_text_cache.get(p)
+    if text is None:
+        text = paragraph.text
+        _para_text_cache[p] = text
+    return text
+
+
+def invalidate_paragraph_text(p_element) -> None:
+    """使指定段落 (w:p 元素) 的文本缓存失效，供修改文本的操作调用。"""
+    _para_text_cache.pop(p_element, None)
+
+
 class Condition(ABC):
     """'条件'接口 (抽象基类)"""
+    __slots__ = ()
+
     @abstractmethod
     def check(self, element: Any) -> bool:
         """
@@ -26,47 +73,146 @@ class Condition(ABC):
 
 
 class RegexCondition(Condition):
-    """正则表达式条件：检查段落文本是否匹配特定模式。"""
+    """正则表达式条件：检查段落文本是否匹配特定模式。
+
+    对于不含正则元字符的字面量模式（如 '【目标:文本替换】'），
+    直接使用 C 级别的子串查找，跳过正则引擎。
+    """
+    __slots__ = ('pattern', '_literal', '_search')
+
     def __init__(self, pattern: str):
-        self.pattern = re.compile(pattern)
+        self.pattern = _compile(pattern)
+        # 字面量模式走子串匹配快速路径
+        self._literal = pattern if re.escape(pattern) == pattern else None
+        # 预绑定 search，check 热路径上省一次属性查找
+        self._search = self.pattern.search
 
     def check(self, element: Any) -> bool:
-        if isinstance(element, Paragraph):
-            return bool(self.pattern.search(element.text))
+        if type(element) is Paragraph:
+            text = cached_paragraph_text(element)
+            if self._literal is not None:
+                return self._literal in text
+            return self._search(text) is not None
         return False
 
 
+class MultiRegexCondition(Condition):
+    """多模式正则条件：把若干模式合并成单个交替正则，一次扫描判定。
+
+    与对同一批段落逐个跑 N 个 RegexCondition 相比，每段文本只做
+    一次 search；matches_which 返回命中的模式序号，配合选择器的
+    apply_branch 可以按模式分派不同的操作组。
+    """
+    __slots__ = ('patterns', '_search')
+
+    def __init__(self, patterns):
+        """
+        :param patterns: 正则模式字符串序列；交替按给定顺序拼接，
+                         同一位置多个模式可命中时取最先出现的匹配。
+        """
+        self.patterns = list(patterns)
+        # 具名分组用于回溯命中的是哪个模式（依赖分组名，不走 re2）
+        combined = '|'.join(
+            f'(?P<g{i}>{p})' for i, p in enumerate(self.patterns))
+        self._search = re.compile(combined).search
+
+    def check(self, element: Any) -> bool:
+        if type(element) is Paragraph:
+            return self._search(cached_paragraph_text(element)) is not None
+        return False
+
+    def matches_which(self, element: Any):
+        """返回命中的模式序号 (int)，未命中返回 None。"""
+        if type(element) is not Paragraph:
+            return None
+        match = self._search(cached_paragraph_text(element))
+        if match is None:
+            return None
+        return int(match.lastgroup[1:])
+
+
 class TableColumnCondition(Condition):
     """表格列数条件：检查表格是否具有指定的列数。"""
+    __slots__ = ('column_count',)
+
     def __init__(self, column_count: int):
         self.column_count = column_count
 
     def check(self, element: Any) -> bool:
-        if isinstance(element, Table):
+        if type(element) is Table:
             return len(element.columns) == self.column_count
         return False
 
 
 class TableTextCondition(Condition):
     """表格文本条件：检查表格是否包含特定文本。"""
+    __slots__ = ('text',)
+
     def __init__(self, text: str):
         self.text = text
 
     def check(self, element: Any) -> bool:
-        if isinstance(element, Table):
-            for row in element.rows:
-                for cell in row.cells:
-                    for paragraph in cell.paragraphs:
-                        if self.text in paragraph.text:
-                            return True
+        if type(element) is Table:
+            # 用 lxml 的 C 级 itertext() 流式遍历表格内全部文本节点，
+            # 不构造 _Row/_Cell/Paragraph 包装对象；any() 命中即短路。
+            needle = self.text
+            return any(needle in text for text in element._tbl.itertext())
         return False
 
 
-class FunctionCondition(Condition):
-    """通用函数条件：使用一个自定义函数作为检查逻辑。"""
+class _UncheckedFunctionCondition(Condition):
+    """内部使用的无守卫函数条件。
+
+    与 FunctionCondition(safe=False) 等价，但不带 try/except 路径，
+    并用 __slots__ 省去实例字典。供 in_section/from_section 这类
+    自身闭包确定不会抛异常的内部调用方使用。
+    """
+    __slots__ = ('func',)
+
     def __init__(self, func: Callable[[Any], bool]):
         self.func = func
 
+    def check(self, element: Any) -> bool:
+        return self.func(element)
+
+
+class FunctionCondition(Condition):
+    """通用函数条件：使用一个自定义函数作为检查逻辑。
+
+    注意：不能加 __slots__ —— safe=False 时会把 func 赋成实例属性
+    check 来遮蔽类方法，这要求实例带 __dict__。
+    """
+    def __init__(self, func: Callable[[Any], bool], safe: bool = True,
+                 memoize: bool = False):
+        """
+        :param func: 接收文档元素并返回 bool 的可调用对象。
+        :param safe: 为 True 时捕获 func 抛出的异常并视为不匹配；
+                     对确定不会抛异常的谓词可传 False，免去每个
+                     元素上 try/except 的建帧开销。
+        :param memoize: 为 True 时以元素的 XML 对象为键缓存结果，
+                        同一元素被多条筛选链重复检查时免于重复求值。
+                        仅适用于求值开销大、且在处理期间结果不变的
+                        纯谓词。
+        """
+        if memoize:
+            cache = WeakKeyDictionary()
+            inner = func
+
+            def func(element):
+                # 以底层 XML 元素为键：包装对象可能被重建，XML 元素稳定
+                key = getattr(element, '_element', element)
+                try:
+                    return cache[key]
+                except KeyError:
+                    result = inner(element)
+                    cache[key] = result
+                    return result
+
+        self.func = func
+        if not safe:
+            # 直接以 func 覆盖 check，筛选热循环中少一层包装调用
+            self.check = func
+
     def check(self, element: Any) -> bool:
         try:
             return self.func(element)
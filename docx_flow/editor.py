@@ -9,92 +9,141 @@ from typing import Any
 
 from docx import Document
 from docx.document import Document as DocumentClass
+from docx.oxml.ns import qn
 from docx.table import Table
 from docx.text.paragraph import Paragraph
 from docx.section import Section
 
+from .actions import SetPageNumberingAction
 from .selector import FluentSelector
 
+# 块级元素的限定标签名：比对 lxml 缓存的 tag 字符串做一次精确比较，
+# 比 .endswith() 的子串匹配更快也更严格（'p' 会误匹配其他标签尾缀）。
+_P_TAG = qn('w:p')
+_TBL_TAG = qn('w:tbl')
+
+
+class _PageNumberingFacade:
+    """页码方案的草稿视图：clear/set 只记录期望终态，commit 才落盘。
+
+    逐节交替执行 Clear/Add 操作会对同一页脚做多轮 XML 改写；这里把
+    所有设定先累积在 Python 字典里，commit 时交给
+    SetPageNumberingAction 做单次节遍历，每个页脚至多被改写一次。
+    commit 由 editor.save() 自动调用，也可以手动触发。
+    """
+    def __init__(self, editor: 'DocxEditor'):
+        self._editor = editor
+        self._specs = {}
+
+    def clear(self, section_idx: int = None) -> '_PageNumberingFacade':
+        """记录清除页码；不给节索引时对全部节生效。"""
+        if section_idx is None:
+            for i in range(len(self._editor._sections)):
+                self._specs[i] = None
+        else:
+            self._specs[section_idx] = None
+        return self
+
+    def set(self, section_idx: int, **spec) -> '_PageNumberingFacade':
+        """记录为指定节设置页码，关键字参数同 AddPageNumberAction。"""
+        self._specs[section_idx] = spec
+        return self
+
+    def commit(self) -> None:
+        """把累积的页码方案一次性应用到文档，并清空草稿。"""
+        if not self._specs:
+            return
+        specs, self._specs = self._specs, {}
+        self._editor.select_sections().apply(SetPageNumberingAction(specs))
+
 
 class DocxEditor:
     """库的主入口，负责文档的加载、保存和元素选择。"""
     def __init__(self, docx_path: str):
         self.document: DocumentClass = Document(docx_path)
-        self._paragraph_section_map = {}
-        self._table_section_map = {}
+        self._para_xml_to_section = {}
+        self._table_xml_to_section = {}
+        self._sectPr_to_idx = {}
         self._build_element_section_map()
+        # 缓存包装对象列表：document.paragraphs / tables / sections 每次
+        # 访问都会重新构造全部包装对象，重复 select_* 调用直接复用。
+        # 若在编辑器外对文档做了结构性增删，需调用 refresh() 重建。
+        self._paragraphs = list(self.document.paragraphs)
+        self._tables = list(self.document.tables)
+        self._sections = list(self.document.sections)
+        self._page_numbering = None
+
+    @property
+    def page_numbering(self) -> _PageNumberingFacade:
+        """页码草稿接口，见 _PageNumberingFacade。首次访问时创建。"""
+        if self._page_numbering is None:
+            self._page_numbering = _PageNumberingFacade(self)
+        return self._page_numbering
+
+    def refresh(self):
+        """结构性修改（增删段落/表格/节）后重建缓存的列表和节映射。"""
+        self._build_element_section_map()
+        self._paragraphs = list(self.document.paragraphs)
+        self._tables = list(self.document.tables)
+        self._sections = list(self.document.sections)
 
     def _build_element_section_map(self):
         """
-        构建一个从元素索引到其节索引的映射。
+        构建从元素的 XML 对象到其节索引的映射。
+        以 XML 元素为键（lxml 元素按身份哈希），查询为 O(1)，
         这是确定一个元素属于哪个节的更准确的方法。
         """
-        self._paragraph_section_map = {}  # 映射段落索引 -> 节索引
-        self._table_section_map = {}      # 映射表格索引 -> 节索引
-        
+        self._para_xml_to_section = {}   # 映射 w:p 元素 -> 节索引
+        self._table_xml_to_section = {}  # 映射 w:tbl 元素 -> 节索引
+
         section_idx = 0
-        para_idx = 0
-        table_idx = 0
 
         # 遍历文档主体中的所有块级元素
         for block_element in self.document.element.body:
             # 检查元素的标签以确定是段落还是表格
-            if block_element.tag.endswith('p'):  # 这是一个段落
-                self._paragraph_section_map[para_idx] = section_idx
-                
+            tag = block_element.tag
+            if tag == _P_TAG:  # 这是一个段落
+                self._para_xml_to_section[block_element] = section_idx
+
                 # 检查此段落的属性中是否有分节符
                 if block_element.pPr is not None and block_element.pPr.sectPr is not None:
                     section_idx += 1
-                
-                para_idx += 1
 
-            elif block_element.tag.endswith('tbl'):  # 这是一个表格
-                self._table_section_map[table_idx] = section_idx
-                table_idx += 1
+            elif tag == _TBL_TAG:  # 这是一个表格
+                self._table_xml_to_section[block_element] = section_idx
+
+        # Section 包装对象每次访问 document.sections 都会重建，
+        # 因此以底层的 sectPr 元素为键。
+        self._sectPr_to_idx = {
+            section._sectPr: i for i, section in enumerate(self.document.sections)
+        }
 
     def get_element_section_index(self, element: Any) -> int:
         """获取给定元素的节索引。"""
         if isinstance(element, Paragraph):
-            # 通过其XML元素（这是稳定的）找到段落的索引。
-            all_paras_xml = [p._p for p in self.document.paragraphs]
-            try:
-                para_index = all_paras_xml.index(element._p)
-                return self._paragraph_section_map.get(para_index, 0)
-            except ValueError:
-                return 0  # 对于来自文档的元素，不应发生
+            return self._para_xml_to_section.get(element._p, 0)
         elif isinstance(element, Table):
-            # 通过其XML元素找到表格的索引。
-            all_tables_xml = [t._tbl for t in self.document.tables]
-            try:
-                table_index = all_tables_xml.index(element._tbl)
-                return self._table_section_map.get(table_index, 0)
-            except ValueError:
-                return 0
+            return self._table_xml_to_section.get(element._tbl, 0)
         elif isinstance(element, Section):
-            # Section对象：返回其在sections列表中的索引
-            try:
-                sections_list = list(self.document.sections)
-                return sections_list.index(element)
-            except ValueError:
-                # 如果找不到，尝试通过节属性匹配
-                for i, section in enumerate(self.document.sections):
-                    if section._sectPr is element._sectPr:
-                        return i
-                return 0
+            return self._sectPr_to_idx.get(element._sectPr, 0)
         return 0
 
     def select_paragraphs(self) -> FluentSelector:
         """选择文档中的所有段落。"""
-        return FluentSelector(list(self.document.paragraphs), self)
+        return FluentSelector(list(self._paragraphs), self)
 
     def select_tables(self) -> FluentSelector:
         """选择文档中的所有表格。"""
-        return FluentSelector(list(self.document.tables), self)
+        return FluentSelector(list(self._tables), self)
 
     def select_sections(self) -> FluentSelector:
         """选择文档中的所有节。"""
-        return FluentSelector(list(self.document.sections), self)
+        return FluentSelector(list(self._sections), self)
 
     def save(self, output_path: str):
-        """保存修改后的文档。"""
-        self.document.save(output_path)
\ No newline at end of file
+        """保存修改后的文档。未提交的页码草稿会先被提交。"""
+        if self._page_numbering is not None:
+            self._page_numbering.commit()
+        # 用带大缓冲的文件句柄写出，避免 zip 序列化产生的碎片化小写入
+        with open(output_path, 'wb', buffering=1 << 20) as f:
+            self.document.save(f)
\ No newline at end of file
@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+"""
+Docx Flow - 谓词辅助模块
+
+为 FunctionCondition 提供常用的高效谓词辅助函数。
+这些函数直接读取 XML 层的数据，避免构造 python-docx 包装对象。
+"""
+
+from docx.text.paragraph import Paragraph
+
+
+def run_count(paragraph: Paragraph) -> int:
+    """返回段落中 run (w:r) 的数量。
+
+    len(paragraph.runs) 会为每个 w:r 构造一个 Run 包装对象；
+    这里直接读取 XML 层的 r_lst 序列，零分配。
+    """
+    return len(paragraph._p.r_lst)
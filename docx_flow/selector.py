@@ -5,60 +5,198 @@ Docx Enhanced Toolkit - 流畅选择器模块
 包含流畅选择器类，支持链式调用。
 """
 
+import logging
 from typing import List, Any, TYPE_CHECKING
 
-from .conditions import Condition, FunctionCondition
+from docx.oxml.ns import qn
+from docx.table import Table
+from docx.text.paragraph import Paragraph
+
+from .conditions import (Condition, _UncheckedFunctionCondition,
+                         cached_paragraph_text)
 
 if TYPE_CHECKING:
     from .editor import DocxEditor
 
+_log = logging.getLogger(__name__)
+
+_QN_T = qn('w:t')
+
 
 class FluentSelector:
-    """流畅选择器，支持链式调用。"""
-    def __init__(self, elements: List[Any], editor: 'DocxEditor'):
-        self._elements = elements
+    """流畅选择器，支持链式调用。
+
+    筛选是惰性的：where/in_section/from_section 只是把谓词追加到
+    过滤链上，直到 get/count/apply/get_by_index 消费时才把整条链
+    融合成对源列表的单次遍历，链式调用不再产生逐级的中间列表。
+    """
+    def __init__(self, elements: List[Any], editor: 'DocxEditor', _filters=None):
+        self._source = elements
         self._editor = editor
+        self._filters = _filters if _filters is not None else []
+        self._materialized = None  # 物化结果缓存
+
+    def _materialize(self) -> List[Any]:
+        """把过滤链应用到源列表上，结果缓存供重复消费。"""
+        if self._materialized is None:
+            filters = self._filters
+            if not filters:
+                self._materialized = self._source
+            elif len(filters) == 1:
+                f = filters[0]
+                self._materialized = [e for e in self._source if f(e)]
+            else:
+                self._materialized = [e for e in self._source
+                                      if all(f(e) for f in filters)]
+        return self._materialized
+
+    def _chain(self, predicate) -> 'FluentSelector':
+        """追加一个谓词，返回共享源列表的新选择器。"""
+        return FluentSelector(self._source, self._editor,
+                              self._filters + [predicate])
 
     def get_by_index(self, index: int) -> 'FluentSelector':
+        elements = self._materialize()
         # 把负索引转换为正索引
         if index < 0:
-            index += len(self._elements)
-        if 0 <= index < len(self._elements):
-            return FluentSelector([self._elements[index]], self._editor)
+            index += len(elements)
+        if 0 <= index < len(elements):
+            return FluentSelector([elements[index]], self._editor)
         return FluentSelector([], self._editor)
 
     def where(self, condition: Condition) -> 'FluentSelector':
         """根据 Condition 对象筛选元素。"""
-        filtered = [elem for elem in self._elements if condition.check(elem)]
-        return FluentSelector(filtered, self._editor)
+        literal = getattr(condition, '_literal', None)
+        if literal is not None:
+            # 字面量 RegexCondition：内联成缓存文本上的子串扫描，
+            # 省去每个元素一次 check 方法调用。
+            def predicate(elem, _lit=literal):
+                return (type(elem) is Paragraph
+                        and _lit in cached_paragraph_text(elem))
+            return self._chain(predicate)
+        return self._chain(condition.check)
+
+    def _section_map_for(self):
+        """源列表元素同质（全段落或全表格）时返回对应的节索引映射。
+
+        select_paragraphs/select_tables 产出的选区总是同质的，
+        此时可以直接以 XML 元素查编辑器的节映射，省去每个元素一次
+        isinstance 分发和闭包调用。
+        """
+        if self._source:
+            first = type(self._source[0])
+            if first is Paragraph:
+                return self._editor._para_xml_to_section, '_p'
+            if first is Table:
+                return self._editor._table_xml_to_section, '_tbl'
+        return None, None
 
     def in_section(self, section_index: int) -> 'FluentSelector':
         """按节索引筛选元素的便捷方法。"""
+        section_map, xml_attr = self._section_map_for()
+        if section_map is not None:
+            def predicate(e):
+                return section_map.get(getattr(e, xml_attr), 0) == section_index
+            return self._chain(predicate)
+
         def check_func(element):
             return self._editor.get_element_section_index(element) == section_index
-        return self.where(FunctionCondition(check_func))
-    
+        return self.where(_UncheckedFunctionCondition(check_func))
+
     def from_section(self, start_section_index: int) -> 'FluentSelector':
         """从指定节开始筛选元素的便捷方法。"""
+        section_map, xml_attr = self._section_map_for()
+        if section_map is not None:
+            def predicate(e):
+                return section_map.get(getattr(e, xml_attr), 0) >= start_section_index
+            return self._chain(predicate)
+
         def check_func(element):
             idx = self._editor.get_element_section_index(element)
             return idx is not None and idx >= start_section_index
-        return self.where(FunctionCondition(check_func))
+        return self.where(_UncheckedFunctionCondition(check_func))
+
+    def by_length(self, min_len: int) -> 'FluentSelector':
+        """按段落文本长度下限筛选的便捷方法。
+
+        长度直接对 w:p 内的 w:t 文本节点做一遍 C 级 iter 累加得出
+        （不能用 itertext：它还会把元素间的排版空白计入），不构造
+        Run 包装对象，也免去自定义谓词的整条 Python 调用链。
+        """
+        def predicate(element):
+            if type(element) is not Paragraph:
+                return False
+            total = 0
+            for t in element._p.iter(_QN_T):
+                if t.text:
+                    total += len(t.text)
+                    if total >= min_len:
+                        return True
+            return False
+        return self._chain(predicate)
 
     def apply(self, action) -> 'FluentSelector':
         """将一个 Action 应用于所有当前选中的元素。"""
-        if not self._elements:
-            print("没有选中任何元素，无法执行操作。")
-            
-        for element in self._elements:
-            action.execute(element)
+        elements = self._materialize()
+        if not elements:
+            _log.debug("没有选中任何元素，无法执行操作。")
+            return self
+
+        # 选区同质时一次性选定 Action 的类型特化入口
+        # （execute_paragraph/execute_table），循环内不再逐元素分发。
+        first = type(elements[0])
+        if first is Paragraph:
+            fn = getattr(action, 'execute_paragraph', None)
+        elif first is Table:
+            fn = getattr(action, 'execute_table', None)
+        else:
+            fn = None
+        if fn is None:
+            fn = action.execute
+
+        for element in elements:
+            fn(element)
+        return self
+
+    def apply_many(self, branches) -> 'FluentSelector':
+        """一次遍历对每个元素依次评估多组 (条件, 操作列表)。
+
+        等价于对每组执行 where(condition).apply(action...)，但所有
+        条件在同一遍元素扫描中评估，选区只被遍历一次。
+
+        :param branches: (Condition, [Action, ...]) 二元组序列。
+        """
+        prepared = [(condition.check, list(actions))
+                    for condition, actions in branches]
+        for element in self._materialize():
+            for check, actions in prepared:
+                if check(element):
+                    for action in actions:
+                        action.execute(element)
+        return self
+
+    def apply_branch(self, condition, branches) -> 'FluentSelector':
+        """按 MultiRegexCondition 的命中分支对元素应用不同的操作组。
+
+        整个选区只扫描一次：每个元素做一次多模式匹配，命中第 i 个
+        模式就执行 branches[i] 中的操作。
+
+        :param condition: 提供 matches_which 方法的条件对象。
+        :param branches: 操作列表的序列，第 i 项对应第 i 个模式。
+        """
+        matches_which = condition.matches_which
+        for element in self._materialize():
+            idx = matches_which(element)
+            if idx is not None:
+                for action in branches[idx]:
+                    action.execute(element)
         return self
 
     @property
     def count(self) -> int:
         """返回当前选中元素的数量。"""
-        return len(self._elements)
+        return len(self._materialize())
 
     def get(self) -> List[Any]:
         """获取所有当前选中的元素。"""
-        return self._elements
\ No newline at end of file
+        return self._materialize()
@@ -10,9 +10,13 @@
 - 批量格式化
 """
 
+import os
+
 from docx import Document
 from docx.shared import Inches, Cm
+from docx.text.paragraph import Paragraph
 from docx_flow import DocxEditor
+from docx_flow.bulk import populate_table, save_fast
 from docx_flow.conditions import (
     RegexCondition, 
     TableColumnCondition, 
@@ -27,9 +31,23 @@ from docx_flow.actions import (
     SetSectionOrientationAction
 )
 
+# 条件常量：模块加载时构造一次（正则也只编译一次），脚本内复用
+COND_SECRET = RegexCondition(r'机密')
+COND_HIGHLIGHT = RegexCondition(r'重点关注')
+COND_APPENDIX = RegexCondition(r'附录')
+COND_4_COLUMNS = TableColumnCondition(4)
+COND_2_COLUMNS = TableColumnCondition(2)
+
 
 def create_complex_document():
     """创建一个复杂的多节文档"""
+    # 输出比脚本新就跳过重建：重复运行时省去整个 docx 序列化
+    output_path = 'complex_input.docx'
+    if (os.path.exists(output_path)
+            and os.path.getmtime(output_path) >= os.path.getmtime(__file__)):
+        print(f"⏭️ 复杂示例文档已是最新: {output_path}")
+        return
+
     doc = Document()
     
     # 第一节：封面
@@ -47,10 +65,7 @@ def create_complex_document():
     # 添加数据表格
     table1 = doc.add_table(rows=4, cols=4)
     table1.style = 'Table Grid'
-    table1.cell(0, 0).text = '业务数据'
-    table1.cell(0, 1).text = '2022'
-    table1.cell(0, 2).text = '2023' 
-    table1.cell(0, 3).text = '2024'
+    populate_table(table1, [['业务数据', '2022', '2023', '2024']])
     
     # 第三节：附录
     doc.add_section()
@@ -60,10 +75,10 @@ def create_complex_document():
     # 添加另一个表格
     table2 = doc.add_table(rows=3, cols=2)
     table2.style = 'Table Grid'
-    table2.cell(0, 0).text = '技术参数'
-    table2.cell(0, 1).text = '数值'
+    populate_table(table2, [['技术参数', '数值']])
     
-    doc.save('complex_input.docx')
+    # 中间产物存完即被重新读取，不压缩直写
+    save_fast(doc, 'complex_input.docx')
     print("✅ 复杂示例文档已创建: complex_input.docx")
 
 
@@ -80,60 +95,52 @@ def main():
     
     print("\n📝 开始高级处理...")
     
-    # 3. 按节处理：只处理第一节的内容
-    print("  → 处理第一节（封面）...")
-    editor.select_paragraphs() \
-        .in_section(0) \
-        .where(RegexCondition(r'机密')) \
-        .apply(ReplaceTextAction('机密文档', '🔒 机密文档')) \
-        .apply(AlignParagraphAction('center'))
-    
-    # 4. 使用自定义函数条件：处理长段落
-    print("  → 识别并处理长段落...")
+    # 3-5. 段落批处理：四组"条件 → 操作"合并成一次段落遍历
+    # （封面标记、长段落排版、重点内容标记、附录标记）
+    print("  → 批量处理段落（封面/长段落/重点/附录）...")
+
     def is_long_paragraph(p):
         """自定义条件：段落长度超过50字符"""
-        from docx.text.paragraph import Paragraph
         return isinstance(p, Paragraph) and len(p.text.strip()) > 50
-    
-    editor.select_paragraphs() \
-        .where(FunctionCondition(is_long_paragraph)) \
-        .apply(AlignParagraphAction('justify')) \
-        .apply(SetFontSizeAction(11))
-    
-    # 5. 处理重点内容
-    print("  → 标记重点内容...")
-    editor.select_paragraphs() \
-        .where(RegexCondition(r'重点关注')) \
-        .apply(ReplaceTextAction('重点关注', '🎯 重点关注')) \
-        .apply(SetFontSizeAction(13))
+
+    # 节范围限定折叠进条件闭包，这样四组可以共用同一遍扫描
+    section_of = editor.get_element_section_index
+
+    editor.select_paragraphs().apply_many([
+        (FunctionCondition(
+            lambda p: section_of(p) == 0 and COND_SECRET.check(p), safe=False),
+         [ReplaceTextAction('机密文档', '🔒 机密文档'),
+          AlignParagraphAction('center')]),
+        # memoize：若同一段落被多条链重复检查，长度只测一次
+        (FunctionCondition(is_long_paragraph, memoize=True),
+         [AlignParagraphAction('justify'), SetFontSizeAction(11)]),
+        (COND_HIGHLIGHT,
+         [ReplaceTextAction('重点关注', '🎯 重点关注'), SetFontSizeAction(13)]),
+        (FunctionCondition(
+            lambda p: section_of(p) >= 1 and COND_APPENDIX.check(p), safe=False),
+         [ReplaceTextAction('附录', '📎 附录')]),
+    ])
     
     # 6. 表格高级操作：4列表格设置精确列宽
     print("  → 设置4列表格的精确列宽...")
     column_widths = [Cm(3), Cm(2.5), Cm(2.5), Cm(2.5)]
     editor.select_tables() \
-        .where(TableColumnCondition(4)) \
+        .where(COND_4_COLUMNS) \
         .apply(SetTableColumnWidthAction(column_widths))
     
     # 7. 移除2列表格的边框
     print("  → 移除2列表格的边框...")
     editor.select_tables() \
-        .where(TableColumnCondition(2)) \
+        .where(COND_2_COLUMNS) \
         .apply(RemoveTableBordersAction())
     
-    # 8. 从第二节开始的内容添加水印文字
-    print("  → 处理第二节及以后的内容...")
-    editor.select_paragraphs() \
-        .from_section(1) \
-        .where(RegexCondition(r'附录')) \
-        .apply(ReplaceTextAction('附录', '📎 附录'))
-    
-    # 9. 设置第三节为横向页面
+    # 8. 设置第三节为横向页面
     print("  → 设置第三节为横向页面...")
     editor.select_sections() \
         .get_by_index(2) \
         .apply(SetSectionOrientationAction('landscape'))
     
-    # 10. 保存结果
+    # 9. 保存结果
     editor.save('complex_output.docx')
     
     print("\n✅ 高级处理完成！")
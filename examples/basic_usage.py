@@ -6,19 +6,34 @@
 演示如何使用 Docx Flow 进行基本的文档操作。
 """
 
+import os
+
 from docx import Document
 from docx_flow import DocxEditor
+from docx_flow.bulk import populate_table, save_fast
 from docx_flow.conditions import RegexCondition, TableTextCondition
 from docx_flow.actions import (
-    ReplaceTextAction, 
-    AlignParagraphAction, 
+    ReplaceTextAction,
+    AlignParagraphAction,
     SetFontSizeAction,
     AutoFitTableAction
 )
 
+# 条件常量：模块加载时构造一次（正则也只编译一次），脚本内复用
+COND_IMPORTANT = RegexCondition(r'重要提示')
+COND_NOTICE = RegexCondition(r'注意：')
+COND_FINANCE_TABLE = TableTextCondition('财务数据')
+
 
 def create_sample_document():
     """创建一个示例文档用于演示"""
+    # 输出比脚本新就跳过重建：重复运行时省去整个 docx 序列化
+    output_path = 'sample_input.docx'
+    if (os.path.exists(output_path)
+            and os.path.getmtime(output_path) >= os.path.getmtime(__file__)):
+        print(f"⏭️ 示例文档已是最新: {output_path}")
+        return
+
     doc = Document()
     
     # 添加标题
@@ -33,18 +48,15 @@ def create_sample_document():
     table = doc.add_table(rows=3, cols=3)
     table.style = 'Table Grid'
     
-    # 表格标识
-    table.cell(0, 0).text = '财务数据'
-    table.cell(0, 1).text = 'Q1'
-    table.cell(0, 2).text = 'Q2'
-    table.cell(1, 0).text = '收入'
-    table.cell(1, 1).text = '100万'
-    table.cell(1, 2).text = '120万'
-    table.cell(2, 0).text = '支出'
-    table.cell(2, 1).text = '80万'
-    table.cell(2, 2).text = '90万'
+    # 表格标识：整表一次性批量填充
+    populate_table(table, [
+        ['财务数据', 'Q1', 'Q2'],
+        ['收入', '100万', '120万'],
+        ['支出', '80万', '90万'],
+    ])
     
-    doc.save('sample_input.docx')
+    # 中间产物存完即被重新读取，不压缩直写
+    save_fast(doc, 'sample_input.docx')
     print("✅ 示例文档已创建: sample_input.docx")
 
 
@@ -64,7 +76,7 @@ def main():
     # 3. 文本替换和格式化
     print("  → 处理重要提示...")
     editor.select_paragraphs() \
-        .where(RegexCondition(r'重要提示')) \
+        .where(COND_IMPORTANT) \
         .apply(ReplaceTextAction('重要提示', '⭐ 重要提示')) \
         .apply(AlignParagraphAction('center')) \
         .apply(SetFontSizeAction(14))
@@ -72,14 +84,14 @@ def main():
     # 4. 处理注意事项
     print("  → 处理注意事项...")
     editor.select_paragraphs() \
-        .where(RegexCondition(r'注意：')) \
+        .where(COND_NOTICE) \
         .apply(ReplaceTextAction('注意：', '⚠️ 注意：')) \
         .apply(SetFontSizeAction(12))
     
     # 5. 处理表格
     print("  → 优化表格显示...")
     editor.select_tables() \
-        .where(TableTextCondition('财务数据')) \
+        .where(COND_FINANCE_TABLE) \
         .apply(AutoFitTableAction('window'))
     
     # 6. 保存结果
@@ -6,15 +6,27 @@
 演示如何使用 docx_flow 为 Word 文档添加和管理页码。
 """
 
+import os
+
 from docx import Document
 from docx_flow import DocxEditor
-from docx_flow.actions import AddPageNumberAction, ClearPageNumberAction
+from docx_flow.bulk import bulk_add_paragraphs, save_fast
 
 
 def create_test_document():
     """创建测试文档"""
+    # 输出比脚本新就跳过重建：重复运行时省去整个 docx 序列化
+    filename = "test_document.docx"
+    if (os.path.exists(filename)
+            and os.path.getmtime(filename) >= os.path.getmtime(__file__)):
+        print(f"测试文档已是最新: {filename}")
+        return filename
+
     doc = Document()
-    
+
+    # 段落正文的重复后缀只构造一次，循环里仅格式化前缀
+    body = '段内容。' * 15
+
     # 第一节：封面页
     doc.add_heading('封面页', level=0)
     doc.add_paragraph('这是文档的封面页，不应该有页码。')
@@ -30,25 +42,23 @@ def create_test_document():
     doc.add_section()
     doc.add_heading('第一章 引言', level=1)
     doc.add_paragraph('这是第一章的内容。从这里开始应该有页码。')
-    for i in range(3):
-        doc.add_paragraph(f'第一章第{i+1}段内容。' * 15)
+    bulk_add_paragraphs(doc, [f'第一章第{i+1}{body}' for i in range(3)])
     
     # 第四节：第二章
     doc.add_section()
     doc.add_heading('第二章 方法', level=1)
     doc.add_paragraph('这是第二章的内容，页码应该继续。')
-    for i in range(3):
-        doc.add_paragraph(f'第二章第{i+1}段内容。' * 15)
+    bulk_add_paragraphs(doc, [f'第二章第{i+1}{body}' for i in range(3)])
     
     # 第五节：附录
     doc.add_section()
     doc.add_heading('附录', level=1)
     doc.add_paragraph('这是附录内容，通常重新开始编页码。')
-    for i in range(2):
-        doc.add_paragraph(f'附录第{i+1}段内容。' * 15)
+    bulk_add_paragraphs(doc, [f'附录第{i+1}{body}' for i in range(2)])
     
     filename = "test_document.docx"
-    doc.save(filename)
+    # 中间产物存完即被重新读取，不压缩直写
+    save_fast(doc, filename)
     print(f"创建测试文档: {filename} (包含 {len(doc.sections)} 个节)")
     return filename
 
@@ -63,32 +73,20 @@ def main():
     
     try:
         editor = DocxEditor(input_file)
-        print(f"文档包含 {editor.select_sections().count} 个节")
-        
-        # 测试1: 清除所有页码
-        print("\n测试1: 清除所有页码")
-        editor.select_sections().apply(ClearPageNumberAction())
-        
-        # 测试2: 为第3节添加页码（从1开始）
-        print("测试2: 为第3节添加页码（从1开始）")
-        editor.select_sections().get_by_index(2).apply(AddPageNumberAction(
-            start_number=1, 
-            restart_numbering=True
-        ))
-        
-        # 测试3: 为第4节添加连续页码
-        print("测试3: 为第4节添加连续页码")
-        editor.select_sections().get_by_index(3).apply(AddPageNumberAction(
-            restart_numbering=False
-        ))
-        
-        # 测试4: 为第5节重新开始页码
-        print("测试4: 为第5节重新开始页码")
-        editor.select_sections().get_by_index(4).apply(AddPageNumberAction(
-            start_number=1,
-            restart_numbering=True
-        ))
-        
+        # 选择器绑定一次复用：get_by_index 返回子视图，不影响 sections 本身
+        sections = editor.select_sections()
+        print(f"文档包含 {sections.count} 个节")
+
+        # 起草页码方案：clear/set 只记录状态，不触碰 XML；
+        # editor.save() 时一次节遍历落盘，每个页脚至多改写一次。
+        # 前两节清除页码，第3/5节从1重新编号，第4节连续编号
+        print("\n起草页码方案（保存时单次提交）...")
+        editor.page_numbering.clear(0)
+        editor.page_numbering.clear(1)
+        editor.page_numbering.set(2, start_number=1, restart_numbering=True)
+        editor.page_numbering.set(3, restart_numbering=False)
+        editor.page_numbering.set(4, start_number=1, restart_numbering=True)
+
         # 保存结果
         output_file = "test_output.docx"
         editor.save(output_file)